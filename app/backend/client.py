@@ -10,9 +10,16 @@ from langchain_mcp_adapters.tools import load_mcp_tools
 from mcp import ClientSession, StdioServerParameters
 from mcp.client.stdio import stdio_client
 
+from app.backend.tools.date_resolver import build_date_context
 from app.common.llm_config import llm
 
 
+# date_context相关的提示词规则，基准脚本会换成改动前的规则做对比
+DATE_CONTEXT_RULE = """- !!用户所有提到时间的请求都需要先确定今天的日期: 用户输入末尾的date_context给出了今天的日期，直接使用即可，不需要再调用get_today工具；只有date_context缺失时才调用get_today
+                - date_context中对时间表达的解析只是本地规则给出的参考，请结合用户原话核对，与原话不符或有歧义时以用户原话为准并主动向用户确认
+                - 用户提到的钟点没有说明上午还是下午（例如“3点开会”）时，不要猜测，必须先向用户确认"""
+
+
 async def main():
     server_params = StdioServerParameters(
         command="python",
@@ -91,10 +98,10 @@ class ScheduleAgent():
         self.prompt = await self._get_prompt()
         self.agent_executor = await self._get_agent_executor()
 
-    async def _get_prompt(self):
+    async def _get_prompt(self, date_rule: str = DATE_CONTEXT_RULE):
         prompt = hub.pull("hwchase17/openai-tools-agent")
         original_system_message = prompt.messages[0].prompt.template
-        custom_instruction = """
+        custom_instruction = f"""
             # 1. 角色与身份 (Role & Identity)
             你是一个名为“计划通”的AI助手。你是我个人日程安排的专家，精通使用所有日程管理工具来高效地处理我的请求。
 
@@ -114,7 +121,7 @@ class ScheduleAgent():
             # 4. 交互与沟通风格 (Interaction & Communication Style)
             - !!优先级最高命令: 
                 - !!确定用户身份: 所有操作都必须确认用户的id
-                - !!用户所有提到时间的请求都需要先确定今天的日期
+                {date_rule}
             - 主动澄清: 当我的指令信息不完整或模糊时（例如“明天下午出去玩”），你必须主动提问以获取所有必要信息（必要信息指的是所有在工具参数要求里有(must)标签的参数）。例如，你可以反问：“好的，但是您对于日程的描述过于简单了，您是否想要提供更多的信息来补充日程信息呢，例如具体时间点，和任务详情描述？”
             - !!操作前必须确认!!: 对于任何【创建】、【修改】或【删除】日程的操作，你必须在调用工具执行前，用清晰的语言向我复述你将要进行的操作，并获得我的明确许可（例如，等待我说“可以”、“好的”或“确认”）。
                 - 示例：在创建日程前，你应该说：“好的，我将为您安排一个会议：【主题：项目复盘】，【时间：明天下午3点到4点】，【描述：参与人：张三、李四】。您看可以吗？”
@@ -136,6 +143,12 @@ class ScheduleAgent():
         agent = create_tool_calling_agent(llm, self.tools, self.prompt)
         return AgentExecutor(agent=agent, tools=self.tools, verbose=True)
 
+    def _build_input(self, input: str, user_token: str, with_date_context: bool = True):
+        """拼接本轮输入，默认附上本地解析的date_context，省去llm调用get_today的那一轮迭代"""
+        if not with_date_context:
+            return f"{input} \n\n user_token: {user_token}"
+        return f"{input} \n\n {build_date_context(input)} \n\n user_token: {user_token}"
+
     async def chat_with_agent(self, input: str, session_id: str, user_token: str):
         async with stdio_client(self.server_params) as (read, write):
             async with ClientSession(read, write) as session:
@@ -147,7 +160,7 @@ class ScheduleAgent():
                 if session_id not in self.chat_history_dict:
                     self.chat_history_dict[session_id] = ChatMessageHistory()
 
-                answer = await self.agent_executor.ainvoke({"input": f"{input} \n\n user_token: {user_token}",
+                answer = await self.agent_executor.ainvoke({"input": self._build_input(input, user_token),
                                                        "chat_history": self.chat_history_dict[f"{session_id}"].messages,
                                                        })
                 self.chat_history_dict[f"{session_id}"].add_user_message(input)
@@ -0,0 +1,330 @@
+import datetime
+import re
+from typing import NamedTuple
+
+# 本地规则解析中英文相对日期/时间表达，在调用agent之前把今天的日期和解析出的日期注入上下文，
+# 省去每轮对话中llm先调用get_today工具获取今天日期的那一次迭代。
+# 解析结果只作为参考提示，没有说明上午还是下午的钟点不做猜测，标记为需要向用户确认
+
+WEEKDAY_CN = ["星期一", "星期二", "星期三", "星期四", "星期五", "星期六", "星期日"]
+
+_CN_DIGITS = {"零": 0, "〇": 0, "一": 1, "二": 2, "两": 2, "三": 3, "四": 4,
+              "五": 5, "六": 6, "七": 7, "八": 8, "九": 9}
+_CN_WEEKDAYS = {"一": 0, "二": 1, "三": 2, "四": 3, "五": 4, "六": 5, "日": 6, "天": 6, "七": 6}
+_EN_WEEKDAYS = {"monday": 0, "tuesday": 1, "wednesday": 2, "thursday": 3,
+                "friday": 4, "saturday": 5, "sunday": 6}
+
+_CN_RELATIVE_DAYS = {"大前天": -3, "前天": -2, "昨天": -1, "昨日": -1, "昨晚": -1,
+                     "今天": 0, "今日": 0, "今早": 0, "今晚": 0,
+                     "明天": 1, "明日": 1, "明早": 1, "明晚": 1, "后天": 2, "大后天": 3}
+_EN_RELATIVE_DAYS = {"day before yesterday": -2, "yesterday": -1, "today": 0,
+                     "tomorrow": 1, "day after tomorrow": 2}
+_CN_RELATIVE_YEARS = {"去年": -1, "今年": 0, "明年": 1, "后年": 2}
+_CN_RELATIVE_MONTHS = {"上月": -1, "上个月": -1, "本月": 0, "这月": 0, "这个月": 0, "下月": 1, "下个月": 1}
+
+# 时段决定12小时制钟点如何换算成24小时制
+_AM_PERIODS = ("凌晨", "早上", "早晨", "上午", "今早", "明早", "am")
+_PM_PERIODS = ("下午", "傍晚", "pm")
+_NIGHT_PERIODS = ("晚上", "今晚", "明晚", "昨晚")
+_NOON_PERIOD = "中午"
+_24H_PERIOD = "24h"
+_CN_PERIODS = ("今早", "明早", "今晚", "明晚", "昨晚", "凌晨", "早上", "早晨", "上午", "中午", "下午", "傍晚", "晚上")
+
+_NUM = r"[0-9]{1,2}|[零〇一二两三四五六七八九十]{1,3}"
+_NUM_CHARS = "0-9零〇一二两三四五六七八九十"
+_YEAR = r"[0-9]{4}|[零〇一二三四五六七八九]{4}"
+# “3号楼”“3号会议室”之类的编号不是日期
+_NOT_A_DAY = r"(?!楼|栋|会议|室|房|线|床|门|馆|厅|位|桌|座|车|机|码|选手)"
+
+# 日期和钟点之间允许的连接，例如“明天晚上8点”“明天的下午3点”“tomorrow at 3pm”
+_JOIN_GAP = re.compile(r"\s*(?:的|at)?\s*", re.IGNORECASE)
+# 时间段的连接，例如“晚上7点到9点”“14:00-16:00”
+_RANGE_GAP = re.compile(r"\s*(?:到|至|-|~|～|—|－|to)\s*", re.IGNORECASE)
+
+
+class _Clock(NamedTuple):
+    """尚未换算成24小时制的钟点，day为“明晚”这类自带日期的时段对应的日期"""
+    hour: int
+    minute: int
+    period: str
+    day: datetime.date | None = None
+
+
+def _to_int(text: str) -> int:
+    """把阿拉伯数字或不超过99的中文数字转为整数"""
+    if text.isdigit():
+        return int(text)
+    if "十" not in text:
+        return _CN_DIGITS[text]
+    tens, _, ones = text.partition("十")
+    return (_CN_DIGITS[tens] if tens else 1) * 10 + (_CN_DIGITS[ones] if ones else 0)
+
+
+def _week_start(today: datetime.date) -> datetime.date:
+    """一周从星期一开始"""
+    return today - datetime.timedelta(days=today.weekday())
+
+
+def _upcoming_weekday(today: datetime.date, weekday: int) -> datetime.date:
+    """今天或之后最近的一个星期x"""
+    return today + datetime.timedelta(days=(weekday - today.weekday()) % 7)
+
+
+def _month_start(today: datetime.date, months: int) -> datetime.date:
+    """相对今天所在月份偏移若干个月后的月初"""
+    index = today.year * 12 + today.month - 1 + months
+    return datetime.date(index // 12, index % 12 + 1, 1)
+
+
+def _cn_relative_day(m, today):
+    return today + datetime.timedelta(days=_CN_RELATIVE_DAYS[m.group(0)])
+
+
+def _cn_day_offset(m, today):
+    days = _to_int(m.group(1))
+    if m.group(2) == "前":
+        days = -days
+    return today + datetime.timedelta(days=days)
+
+
+def _cn_week_day(m, today):
+    prefix, weekday = m.group(1) or "", _CN_WEEKDAYS[m.group(3)]
+    if not prefix:
+        return _upcoming_weekday(today, weekday)
+    weeks = {"上": -1, "本": 0, "这": 0, "下": 1, "下下": 2}[prefix.rstrip("个")]
+    return _week_start(today) + datetime.timedelta(weeks=weeks, days=weekday)
+
+
+def _year_to_int(text: str) -> int:
+    """“2025”或“二〇二五”这类逐位书写的年份"""
+    if text.isdigit():
+        return int(text)
+    return int("".join(str(_CN_DIGITS[char]) for char in text))
+
+
+def _cn_month_day(m, today):
+    year, prefix, month, day = m.group(1), m.group(2), _to_int(m.group(3)), _to_int(m.group(4))
+    if year:
+        # 用户写明了年份就照原样使用，不再往后顺延
+        return datetime.date(_year_to_int(year), month, day)
+    if prefix:
+        return datetime.date(today.year + _CN_RELATIVE_YEARS[prefix], month, day)
+    value = datetime.date(today.year, month, day)
+    # 没有说明年份时按将来的日期理解，12月说“1月3号”指的是明年
+    if value < today:
+        value = datetime.date(today.year + 1, month, day)
+    return value
+
+
+def _cn_day_of_month(m, today):
+    prefix, day = m.group(1), _to_int(m.group(2))
+    if prefix:
+        months = _CN_RELATIVE_MONTHS[prefix]
+    else:
+        # 没有说明月份时按将来的日期理解，本月已经过去的日子指下个月
+        months = 0 if day >= today.day else 1
+    return _month_start(today, months).replace(day=day)
+
+
+def _en_relative_day(m, today):
+    key = re.sub(r"\s+", " ", m.group(0).lower()).removeprefix("the ")
+    return today + datetime.timedelta(days=_EN_RELATIVE_DAYS[key])
+
+
+def _en_day_offset(m, today):
+    if m.group(1):
+        return today + datetime.timedelta(days=int(m.group(1)))
+    days = int(m.group(2))
+    return today + datetime.timedelta(days=-days if m.group(3).lower() == "ago" else days)
+
+
+def _en_week_day(m, today):
+    prefix, weekday = (m.group(1) or "").lower(), _EN_WEEKDAYS[m.group(2).lower()]
+    if not prefix:
+        return _upcoming_weekday(today, weekday)
+    weeks = {"last": -1, "this": 0, "next": 1}[prefix]
+    return _week_start(today) + datetime.timedelta(weeks=weeks, days=weekday)
+
+
+def _cn_clock(m, today):
+    period, hour = m.group("period") or "", _to_int(m.group("hour"))
+    minute = {"半": 30, "一刻": 15, "三刻": 45}.get(m.group("frac"))
+    if minute is None:
+        minute = _to_int(m.group("minute")) if m.group("minute") else 0
+    day = None
+    if period in _CN_RELATIVE_DAYS:
+        day = today + datetime.timedelta(days=_CN_RELATIVE_DAYS[period])
+    return _Clock(hour, minute, period, day)
+
+
+def _en_clock(m, today):
+    suffix = m.group(3).lower().replace(".", "")
+    return _Clock(int(m.group(1)), int(m.group(2) or 0), suffix)
+
+
+def _hh_mm(m, today):
+    hour = int(m.group(1))
+    # “08:30”“14:30”是24小时制，“3:30”没有说明上午还是下午
+    period = _24H_PERIOD if m.group(1).startswith("0") or hour == 0 or hour > 12 else ""
+    return _Clock(hour, int(m.group(2)), period)
+
+
+_CN_RELATIVE_DAY_PATTERN = "|".join(
+    # “然后天气”“之前天天”里的“后天”“前天”不是日期
+    rf"(?<![然之以最提]){word}" if word in ("后天", "前天") else word
+    for word in sorted(_CN_RELATIVE_DAYS, key=len, reverse=True)
+)
+
+_RULES = [
+    (re.compile(_CN_RELATIVE_DAY_PATTERN), _cn_relative_day),
+    (re.compile(rf"({_NUM})\s*天(前|后|以后|之后)"), _cn_day_offset),
+    (re.compile(r"(上个?|本|这个?|下下个?|下个?)?(周|星期|礼拜)([一二三四五六日天七])"), _cn_week_day),
+    (re.compile(rf"(?<![{_NUM_CHARS}年])(?:({_YEAR})年|({'|'.join(_CN_RELATIVE_YEARS)}))?"
+                rf"({_NUM})月({_NUM})[日号]{_NOT_A_DAY}"),
+     _cn_month_day),
+    (re.compile(rf"(?<![月{_NUM_CHARS}])"
+                rf"({'|'.join(sorted(_CN_RELATIVE_MONTHS, key=len, reverse=True))})?({_NUM})[日号]{_NOT_A_DAY}"),
+     _cn_day_of_month),
+    # 没有时段时排除“第2点”“快一点”“有一点”这类非钟点的说法
+    (re.compile(rf"(?:(?P<period>{'|'.join(_CN_PERIODS)})|(?<![第{_NUM_CHARS}快慢早晚多少好差有这那]))"
+                rf"(?P<hour>{_NUM})(?:点|时(?![候间期刻代段]))(?P<frac>半|一刻|三刻|(?P<minute>{_NUM})分?)?"),
+     _cn_clock),
+    (re.compile(r"\b(?:the\s+)?day\s+(?:before\s+yesterday|after\s+tomorrow)\b|\b(?:yesterday|today|tomorrow)\b",
+                re.IGNORECASE), _en_relative_day),
+    (re.compile(r"\bin\s+(\d{1,3})\s+days?\b|\b(\d{1,3})\s+days?\s+(ago|later|from\s+now)\b",
+                re.IGNORECASE), _en_day_offset),
+    (re.compile(r"\b(?:(last|this|next)\s+)?(monday|tuesday|wednesday|thursday|friday|saturday|sunday)\b",
+                re.IGNORECASE), _en_week_day),
+    # 不用\b，否则“明天3pm”里汉字和数字之间匹配不上
+    (re.compile(r"(?<![0-9A-Za-z.:])(\d{1,2})(?::(\d{2}))?\s*([ap]\.?m\.?)(?![a-z])", re.IGNORECASE), _en_clock),
+    (re.compile(r"(?<![\d:])([01]?\d|2[0-3]):([0-5]\d)(?![\d:])"), _hh_mm),
+]
+
+
+def _clock_time(clock: _Clock, period: str):
+    """
+    按时段把钟点换算成24小时制
+
+    :return: (datetime.time, 跨到第二天的天数)；没有说明上午还是下午，或者时段和钟点对不上
+             （如“0点”“24点”“上午13点”“下午12点”）时返回None，交给llm向用户确认
+    """
+    hour, minute = clock.hour, clock.minute
+    if period == _24H_PERIOD:
+        pass
+    elif not period:
+        # “0点”“24点”说不清是哪一天的零点
+        if hour <= 12 or hour == 24:
+            return None
+    elif period in _AM_PERIODS:
+        if hour == 12 and period in ("凌晨", "am"):
+            hour = 0
+        elif hour >= 12:
+            return None
+    elif period == _NOON_PERIOD:
+        if 1 <= hour <= 3:
+            hour += 12
+        elif not 11 <= hour <= 14:
+            return None
+    elif period in _PM_PERIODS:
+        if 1 <= hour <= 11:
+            hour += 12
+        elif not (hour == 12 and period == "pm" or 13 <= hour <= 23 and period != "pm"):
+            return None
+    elif period in _NIGHT_PERIODS:
+        # “晚上12点”“晚上1点”已经是第二天凌晨
+        if hour == 12 or hour <= 4:
+            return datetime.time(hour % 12, minute), 1
+        if 5 <= hour <= 11:
+            hour += 12
+        elif not 17 <= hour <= 23:
+            return None
+    return datetime.time(hour, minute), 0
+
+
+def resolve_dates(text: str, today: datetime.date | None = None) -> list:
+    """
+    用规则解析文本中的相对日期/时间表达
+
+    :param text: 用户输入
+    :param today: 基准日期，默认为今天
+    :return: 按出现顺序排列的 (原始表达, 解析结果) 列表，解析结果是 datetime.date、datetime.time、
+             datetime.datetime（日期和钟点连在一起时），或者 None（没有说明上午还是下午的钟点）
+    """
+    today = today or datetime.date.today()
+    matches = []
+    for pattern, handler in _RULES:
+        for m in pattern.finditer(text):
+            try:
+                value = handler(m, today)
+            except (ValueError, KeyError):
+                # 非法日期（如2月30号）交给llm去澄清
+                continue
+            matches.append((m.start(), m.end(), value))
+
+    # 重叠时保留先出现且更长的表达，例如“大后天”不再拆出“后天”
+    matches.sort(key=lambda item: (item[0], item[0] - item[1]))
+    picked = []
+    last_end = -1
+    for start, end, value in matches:
+        if start >= last_end:
+            picked.append((start, end, value))
+            last_end = end
+
+    # 钟点和前面紧挨着的日期合并；时间段后半部分沿用前半部分的时段和日期
+    resolved = []
+    prev_end, prev_date, prev_period = None, None, None
+    for start, end, value in picked:
+        gap = text[prev_end:start] if prev_end is not None else None
+        if not isinstance(value, _Clock):
+            resolved.append([start, end, value])
+            prev_end, prev_date, prev_period = end, value, None
+            continue
+
+        period, base, merge = value.period, value.day, False
+        if prev_period is not None and _RANGE_GAP.fullmatch(gap):
+            period = period or prev_period
+            base = base or prev_date
+        elif value.day is None and prev_date is not None and prev_period is None and _JOIN_GAP.fullmatch(gap):
+            base, merge = prev_date, True
+
+        try:
+            clock = _clock_time(value, period)
+            if clock is None:
+                result, merge = None, False
+            else:
+                time_value, days = clock
+                if base is not None:
+                    result = datetime.datetime.combine(base + datetime.timedelta(days=days), time_value)
+                elif days:
+                    result = datetime.datetime.combine(today + datetime.timedelta(days=days), time_value)
+                else:
+                    result = time_value
+        except ValueError:
+            continue
+
+        if merge:
+            resolved[-1][1:] = [end, result]
+        else:
+            resolved.append([start, end, result])
+        prev_end, prev_date, prev_period = end, base, period
+    return [(text[start:end], value) for start, end, value in resolved]
+
+
+def build_date_context(text: str, today: datetime.date | None = None) -> str:
+    """生成注入到本轮输入中的日期上下文：准确的今天日期，以及仅供参考的时间表达解析结果"""
+    today = today or datetime.date.today()
+    context = f"date_context: 今天是 {today.isoformat()} {WEEKDAY_CN[today.weekday()]}"
+    items = []
+    for expression, value in resolve_dates(text, today):
+        if value is None:
+            items.append(f"“{expression}” 没有说明上午还是下午，需要向用户确认")
+        elif isinstance(value, datetime.datetime):
+            items.append(f"“{expression}” ≈ {value.date().isoformat()} {WEEKDAY_CN[value.weekday()]} "
+                         f"{value.strftime('%H:%M:%S')}")
+        elif isinstance(value, datetime.date):
+            items.append(f"“{expression}” ≈ {value.isoformat()} {WEEKDAY_CN[value.weekday()]}")
+        else:
+            items.append(f"“{expression}” ≈ {value.strftime('%H:%M:%S')}")
+    if items:
+        context += "；以下是本地规则对时间表达的解析，仅供参考：" + "；".join(items)
+    return context
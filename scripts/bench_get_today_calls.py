@@ -0,0 +1,88 @@
+import asyncio
+import sys
+
+from langchain.agents import AgentExecutor
+from langchain.agents import create_tool_calling_agent
+from langchain_mcp_adapters.tools import load_mcp_tools
+from mcp import ClientSession
+from mcp.client.stdio import stdio_client
+
+from app.backend.client import DATE_CONTEXT_RULE, agent
+from app.common.llm_config import llm
+
+# 基准：在同一组对话上对比两种配置，从AgentExecutor的intermediate_steps里统计get_today调用次数和llm迭代轮数
+#   - 改动前：原来的提示词规则（所有提到时间的请求都要先确定今天的日期），输入不带date_context
+#   - 改动后：当前的提示词规则，输入带date_context
+# 运行：python -m scripts.bench_get_today_calls <user_token>（需要.env里配置好模型，查询日程的工具还需要数据库）
+
+# 改动前提示词里关于日期的规则
+LEGACY_DATE_RULE = "- !!用户所有提到时间的请求都需要先确定今天的日期"
+
+TURNS = [
+    "我后天想去看电影",
+    "下周三下午3点半和张三开会",
+    "大后天晚上8点提醒我给妈妈打电话",
+    "我明天有什么安排？",
+    "3天后上午10点体检",
+    "帮我查一下10月25号的日程",
+    "这周五有哪些会议",
+    "明晚8点开会",
+    "what do I have next monday?",
+    "我的用户id是多少",
+]
+
+
+def count_llm_rounds(steps) -> int:
+    """
+    统计一轮对话里llm被调用的次数
+
+    同一次llm回复里并行发起的多个工具调用共享同一条AIMessage，按消息分组才是迭代次数，
+    最后再加上给出最终回答的那一次
+    """
+    messages = set()
+    for action, _ in steps:
+        message_log = getattr(action, "message_log", None)
+        messages.add(id(message_log[0]) if message_log else getattr(action, "tool_call_id", id(action)))
+    return len(messages) + 1
+
+
+async def run_turns(executor: AgentExecutor, user_token: str, with_date_context: bool):
+    """逐轮调用agent，返回每轮的 (get_today调用次数, llm迭代轮数)"""
+    results = []
+    for turn in TURNS:
+        answer = await executor.ainvoke({"input": agent._build_input(turn, user_token, with_date_context),
+                                         "chat_history": [],
+                                         })
+        steps = answer["intermediate_steps"]
+        get_today_calls = sum(1 for action, _ in steps if action.tool == "get_today")
+        results.append((get_today_calls, count_llm_rounds(steps)))
+    return results
+
+
+async def main(user_token: str):
+    async with stdio_client(agent.server_params) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            tools = await load_mcp_tools(session)
+
+            executors = []
+            for date_rule in (LEGACY_DATE_RULE, DATE_CONTEXT_RULE):
+                prompt = await agent._get_prompt(date_rule)
+                executors.append(AgentExecutor(agent=create_tool_calling_agent(llm, tools, prompt),
+                                               tools=tools, return_intermediate_steps=True))
+
+            baseline = await run_turns(executors[0], user_token, with_date_context=False)
+            resolved = await run_turns(executors[1], user_token, with_date_context=True)
+
+    print(f"{'turn':<30}{'get_today(改动前/后)':>20}{'llm迭代(改动前/后)':>20}")
+    for turn, (base_calls, base_rounds), (calls, rounds) in zip(TURNS, baseline, resolved):
+        print(f"{turn:<30}{base_calls:>12} / {calls:<6}{base_rounds:>12} / {rounds:<6}")
+    saved = sum(rounds for _, rounds in baseline) - sum(rounds for _, rounds in resolved)
+    print(f"轮数: {len(TURNS)}, 共省下llm迭代: {saved}, 平均每轮省下: {saved / len(TURNS):.2f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("用法: python -m scripts.bench_get_today_calls <user_token>")
+        sys.exit(1)
+    asyncio.run(main(sys.argv[1]))
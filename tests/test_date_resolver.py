@@ -0,0 +1,227 @@
+import datetime
+
+import pytest
+
+from app.backend.tools.date_resolver import build_date_context, resolve_dates
+
+MONDAY = datetime.date(2026, 10, 19)
+SUNDAY = datetime.date(2026, 10, 25)
+YEAR_END = datetime.date(2026, 12, 28)
+
+
+def d(month, day, year=2026):
+    return datetime.date(year, month, day)
+
+
+def dt(month, day, hour, minute=0, year=2026):
+    return datetime.datetime(year, month, day, hour, minute)
+
+
+@pytest.mark.parametrize("text, expected", [
+    # 中文相对日期
+    ("今天", d(10, 19)),
+    ("明天", d(10, 20)),
+    ("后天", d(10, 21)),
+    ("大后天", d(10, 22)),
+    ("昨天", d(10, 18)),
+    ("前天", d(10, 17)),
+    ("大前天", d(10, 16)),
+    ("今晚", d(10, 19)),
+    ("明晚", d(10, 20)),
+    ("明早", d(10, 20)),
+    ("3天后", d(10, 22)),
+    ("两天前", d(10, 17)),
+    ("十天之后", d(10, 29)),
+    # 英文相对日期
+    ("today", d(10, 19)),
+    ("Tomorrow", d(10, 20)),
+    ("the day after tomorrow", d(10, 21)),
+    ("day before yesterday", d(10, 17)),
+    ("in 5 days", d(10, 24)),
+    ("3 days ago", d(10, 16)),
+    ("2 days from now", d(10, 21)),
+])
+def test_relative_days(text, expected):
+    assert resolve_dates(text, MONDAY) == [(text, expected)]
+
+
+@pytest.mark.parametrize("today, text, expected", [
+    (MONDAY, "周三", d(10, 21)),
+    (MONDAY, "周一", d(10, 19)),
+    (MONDAY, "这周五", d(10, 23)),
+    (MONDAY, "本周日", d(10, 25)),
+    (MONDAY, "下周三", d(10, 28)),
+    (MONDAY, "下个星期一", d(10, 26)),
+    (MONDAY, "下下周日", d(11, 8)),
+    (MONDAY, "上周一", d(10, 12)),
+    (MONDAY, "礼拜天", d(10, 25)),
+    (SUNDAY, "下周日", d(11, 1)),
+    (SUNDAY, "这周一", d(10, 19)),
+    (SUNDAY, "周一", d(10, 26)),
+    (SUNDAY, "周日", d(10, 25)),
+    (MONDAY, "friday", d(10, 23)),
+    (MONDAY, "next monday", d(10, 26)),
+    (MONDAY, "last Friday", d(10, 16)),
+    (SUNDAY, "next sunday", d(11, 1)),
+])
+def test_weekdays(today, text, expected):
+    assert resolve_dates(text, today) == [(text, expected)]
+
+
+@pytest.mark.parametrize("today, text, expected", [
+    (MONDAY, "10月25号", d(10, 25)),
+    (MONDAY, "十二月一日", d(12, 1)),
+    (MONDAY, "25号", d(10, 25)),
+    (MONDAY, "十五号", d(11, 15)),
+    (YEAR_END, "1月3号", d(1, 3, 2027)),
+    (YEAR_END, "3号", d(1, 3, 2027)),
+    (YEAR_END, "明年1月1号", d(1, 1, 2027)),
+    (YEAR_END, "今年1月1号", d(1, 1, 2026)),
+    (YEAR_END, "下个月5号", d(1, 5, 2027)),
+    (MONDAY, "这个月20号", d(10, 20)),
+    (MONDAY, "这个月5号", d(10, 5)),
+    (MONDAY, "上个月5号", d(9, 5)),
+    (MONDAY, "2025年3月1日", d(3, 1, 2025)),
+    (MONDAY, "2026年1月5号", d(1, 5, 2026)),
+    (MONDAY, "2026年12月1号", d(12, 1, 2026)),
+    (MONDAY, "二〇二五年三月一日", d(3, 1, 2025)),
+])
+def test_absolute_dates(today, text, expected):
+    assert resolve_dates(text, today) == [(text, expected)]
+
+
+@pytest.mark.parametrize("text", ["2月30号", "11月31日", "13月1号"])
+def test_invalid_dates_are_left_unresolved(text):
+    assert resolve_dates(text, MONDAY) == []
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("上午10点", datetime.time(10, 0)),
+    ("下午3点半", datetime.time(15, 30)),
+    ("下午3点一刻", datetime.time(15, 15)),
+    ("早上8点20分", datetime.time(8, 20)),
+    ("中午12点", datetime.time(12, 0)),
+    ("中午1点", datetime.time(13, 0)),
+    ("凌晨12点", datetime.time(0, 0)),
+    ("晚上8点", datetime.time(20, 0)),
+    ("15点", datetime.time(15, 0)),
+    ("3pm", datetime.time(15, 0)),
+    ("10:30 a.m.", datetime.time(10, 30)),
+    ("12am", datetime.time(0, 0)),
+    ("14:30", datetime.time(14, 30)),
+    ("08:30", datetime.time(8, 30)),
+])
+def test_clock_times(text, expected):
+    assert resolve_dates(text, MONDAY) == [(text, expected)]
+
+
+@pytest.mark.parametrize("text", ["3点", "十点半", "3:30", "0点", "24点"])
+def test_clock_without_period_is_unresolved(text):
+    assert resolve_dates(text, MONDAY) == [(text, None)]
+
+
+@pytest.mark.parametrize("text", ["上午13点", "早上12点", "下午12点", "中午6点", "晚上15点", "13pm"])
+def test_period_and_hour_mismatch_is_unresolved(text):
+    assert resolve_dates(text, MONDAY) == [(text, None)]
+
+
+def test_bare_hour_in_sentence_is_unresolved():
+    assert resolve_dates("3点开会", MONDAY) == [("3点", None)]
+
+
+def test_night_midnight_is_next_day():
+    assert resolve_dates("晚上12点", MONDAY) == [("晚上12点", dt(10, 20, 0))]
+    assert resolve_dates("明天晚上12点", MONDAY) == [("明天晚上12点", dt(10, 21, 0))]
+
+
+def test_date_and_clock_are_merged():
+    assert resolve_dates("明天下午3点开会", MONDAY) == [("明天下午3点", dt(10, 20, 15))]
+    assert resolve_dates("下周三的上午10点", MONDAY) == [("下周三的上午10点", dt(10, 28, 10))]
+    assert resolve_dates("tomorrow at 3pm", MONDAY) == [("tomorrow at 3pm", dt(10, 20, 15))]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("明天3pm", dt(10, 20, 15)),
+    ("周三3pm", dt(10, 21, 15)),
+    ("明天 3pm", dt(10, 20, 15)),
+    ("后天10:30am", dt(10, 21, 10, 30)),
+])
+def test_date_directly_followed_by_am_pm(text, expected):
+    assert resolve_dates(text, MONDAY) == [(text, expected)]
+
+
+def test_date_is_kept_when_clock_is_unresolved():
+    assert resolve_dates("明天3点", MONDAY) == [("明天", d(10, 20)), ("3点", None)]
+
+
+@pytest.mark.parametrize("text", ["明晚8点开会", "明天晚上8点开会"])
+def test_tomorrow_evening(text):
+    assert resolve_dates(text, MONDAY) == [(text.removesuffix("开会"), dt(10, 20, 20))]
+
+
+def test_morning_words_carry_date():
+    assert resolve_dates("今早9点", MONDAY) == [("今早9点", dt(10, 19, 9))]
+    assert resolve_dates("明早7点半", MONDAY) == [("明早7点半", dt(10, 20, 7, 30))]
+
+
+def test_range_carries_period_and_date():
+    assert resolve_dates("明天晚上7点到9点", MONDAY) == [
+        ("明天晚上7点", dt(10, 20, 19)),
+        ("9点", dt(10, 20, 21)),
+    ]
+    assert resolve_dates("下午3点-5点", MONDAY) == [
+        ("下午3点", datetime.time(15, 0)),
+        ("5点", datetime.time(17, 0)),
+    ]
+    assert resolve_dates("明天晚上11点到12点", MONDAY) == [
+        ("明天晚上11点", dt(10, 20, 23)),
+        ("12点", dt(10, 21, 0)),
+    ]
+
+
+def test_range_does_not_carry_period_across_other_words():
+    assert resolve_dates("下午3点开会，5点吃饭", MONDAY) == [
+        ("下午3点", datetime.time(15, 0)),
+        ("5点", None),
+    ]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("大后天", [("大后天", d(10, 22))]),
+    ("大前天", [("大前天", d(10, 16))]),
+    ("下下周三", [("下下周三", d(11, 4))]),
+    ("12月1日", [("12月1日", d(12, 1))]),
+    ("明晚", [("明晚", d(10, 20))]),
+    ("后天下午3点半和张三开会", [("后天下午3点半", dt(10, 21, 15, 30))]),
+])
+def test_overlapping_expressions_keep_longest(text, expected):
+    assert resolve_dates(text, MONDAY) == expected
+
+
+@pytest.mark.parametrize("text", [
+    "然后天气怎么样",
+    "之前天天加班",
+    "以后天天早起",
+    "在3号会议室开会",
+    "去3号楼",
+    "第2点建议",
+    "快一点",
+    "有一点累",
+    "这一点很重要",
+    "那时候还没有",
+])
+def test_false_positives(text):
+    assert resolve_dates(text, MONDAY) == []
+
+
+def test_build_date_context():
+    context = build_date_context("明天晚上7点到9点，3点也行", MONDAY)
+    assert context.startswith("date_context: 今天是 2026-10-19 星期一")
+    assert "仅供参考" in context
+    assert "“明天晚上7点” ≈ 2026-10-20 星期二 19:00:00" in context
+    assert "“9点” ≈ 2026-10-20 星期二 21:00:00" in context
+    assert "“3点” 没有说明上午还是下午，需要向用户确认" in context
+
+
+def test_build_date_context_without_expressions():
+    assert build_date_context("我的用户id是多少", MONDAY) == "date_context: 今天是 2026-10-19 星期一"